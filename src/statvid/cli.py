@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import argparse
 from .logging_config import configure_logging
+from .ingest.ingest import discover_channels
 # from .pipelines.pipeline import run_pipeline
 
 
@@ -14,8 +15,11 @@ def build_parser() -> argparse.ArgumentParser:
     p_run.add_argument("--limit", type=int, default=100, help="Max videos to ingest")
     p_run.add_argument("--model", type=str, default="ridge", choices=["ridge", "lightgbm"])
     p_run.add_argument("--dry-run", action="store_true", help="Plan without writing outputs")
+    p_run.add_argument("--workers", type=int, default=4, help="Categories to ingest concurrently")
 
-    sub.add_parser("ingest", help="Only run ingestion")
+    p_ingest = sub.add_parser("ingest", help="Only run ingestion")
+    p_ingest.add_argument("--refresh", action="store_true", help="Ignore cached search results")
+    p_ingest.add_argument("--workers", type=int, default=4, help="Categories to ingest concurrently")
     sub.add_parser("features", help="Only run feature engineering")
     sub.add_parser("train", help="Only train models")
 
@@ -30,8 +34,7 @@ def main() -> None:
 #    if args.command == "run":
 #        run_pipeline(limit=args.limit, model=args.model, dry_run=args.dry_run)
     if args.command == "ingest":
-        # Placeholder: call ingestion step
-        pass
+        discover_channels(refresh=args.refresh, workers=args.workers)
     elif args.command == "features":
         # Placeholder: call feature step
         pass
@@ -1,11 +1,15 @@
 """Configuration loading via environment variables with sane defaults."""
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
-load_dotenv()
+# worker processes inherit the environment, so only the first process parses .env
+if not os.environ.get("_STATVID_ENV_LOADED"):
+    load_dotenv()
+    os.environ["_STATVID_ENV_LOADED"] = "1"
 
 
 @dataclass(frozen=True)
@@ -14,9 +18,11 @@ class AppConfig:
     data_dir: str = os.getenv('DATA_DIR', "./data")
     log_level: str = os.getenv('LOG_LEVEL', "INFO")
     youtube_api_key: str | None = os.getenv('YOUTUBE_API_KEY')
+    cache_ttl_seconds: int = int(os.getenv('CACHE_TTL_SECONDS', "86400"))
 
 
+@functools.lru_cache(maxsize=1)
 def get_config() -> AppConfig:
-    """Return loaded app configuration."""
+    """Return loaded app configuration (built once per process)."""
     return AppConfig()
 
@@ -1,18 +1,24 @@
 """Ingestion orchestration: fetch from API and write Bronze parquet."""
 from __future__ import annotations
 
+import functools
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Iterable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from ..config import get_config
 from ..logging_config import configure_logging
-from ..utils.io import ensure_dir, write_parquet
+from ..utils.io import ensure_dir, write_parquet, write_parquet_table
 from ..utils.paths import get_paths
-from .youtube_client import YouTubeClient
+from .youtube_client import YouTubeClient, extract_video_ids
 
 log = logging.getLogger(__name__)
 
@@ -36,6 +42,9 @@ MIN_SUBSCRIBERS = 10_000
 MIN_UPLOADS_LAST_YEAR = 10
 TARGET_CHANNELS_PER_CATEGORY = 50
 DEFAULT_OVERFETCH_FACTOR = 4  # gather more candidates to balance subs
+DEFAULT_CATEGORY_WORKERS = 4  # categories discovered concurrently
+ACTIVITY_PROBE_WORKERS = 16  # concurrent uploads-playlist fetches per category
+CANDIDATE_COLUMNS = ["id", "uploads_playlist_id", "subscriberCount", "country", "videoCount"]
 
 
 def _bronze_dir(output_dir: Optional[str]) -> str:
@@ -45,6 +54,29 @@ def _bronze_dir(output_dir: Optional[str]) -> str:
     return base
 
 
+@dataclass(frozen=True)
+class BronzeDirs:
+    search: Path
+    channels: Path
+    category_uploads: Path
+    selection: Path
+
+
+def _bronze_dirs(output_dir: Optional[str]) -> BronzeDirs:
+    """Resolve and create the discovery output directories once per run."""
+    base = Path(_bronze_dir(output_dir))
+    dirs = BronzeDirs(
+        search=base / "search",
+        channels=base / "channels",
+        # kept apart from ingest_channel's uploads/<channel_id>.parquet, which has no channel_id column
+        category_uploads=base / "uploads" / "by_category",
+        selection=base / "channel_selection",
+    )
+    for d in (dirs.search, dirs.channels, dirs.category_uploads, dirs.selection):
+        d.mkdir(parents=True, exist_ok=True)
+    return dirs
+
+
 def _parse_published_at(published_at: Optional[str]) -> Optional[datetime]:
     if not published_at:
         return None
@@ -54,76 +86,75 @@ def _parse_published_at(published_at: Optional[str]) -> Optional[datetime]:
         return None
 
 
+def _iso_days_ago(days: int) -> str:
+    """Return the UTC instant `days` ago in YouTube's `YYYY-MM-DDTHH:MM:SSZ` form."""
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 def _count_recent_uploads(uploads: List[Dict[str, object]], *, lookback_days: int) -> Tuple[int, List[str]]:
     """Return (number of uploads in window, video ids) for playlist items."""
-    threshold = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    # UTC ISO-8601 timestamps order lexicographically, so compare strings instead of parsing
+    threshold_iso = _iso_days_ago(lookback_days)
     count = 0
     video_ids: List[str] = []
     for video in uploads:
-        published_at = (
-            video.get("contentDetails", {}).get("videoPublishedAt")
-            or video.get("snippet", {}).get("publishedAt")
-        )
-        dt = _parse_published_at(published_at)
-        if dt and dt >= threshold:
+        details = video.get("contentDetails", {})
+        published_at = details.get("videoPublishedAt") or video.get("snippet", {}).get("publishedAt")
+        if published_at and published_at >= threshold_iso:
             count += 1
-            vid_id = video.get("contentDetails", {}).get("videoId")
+            vid_id = details.get("videoId")
             if vid_id:
                 video_ids.append(vid_id)
     return count, video_ids
 
 
-def _to_frame(items: List[Dict[str, object]]) -> pd.DataFrame:
-    """Normalize list of dicts to a DataFrame that is safe for Parquet writes."""
+def _to_table(items: List[Dict[str, object]]) -> pa.Table:
+    """Build a flat Arrow table from API items; nested fields become dotted columns."""
     if not items:
-        return pd.DataFrame({"_empty": []})
-    return pd.json_normalize(items)
+        return pa.table({"_empty": pa.array([], type=pa.null())})
+    # Arrow infers the nested schema across all items in C++, avoiding pd.json_normalize
+    table = pa.Table.from_struct_array(pa.array(items))
+    while any(pa.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+    return table
 
 
 def _normalize_channels_df(channel_items: List[Dict[str, object]]) -> pd.DataFrame:
-    df = pd.json_normalize(channel_items)
-    if "statistics.subscriberCount" in df.columns:
-        df["subscriberCount"] = pd.to_numeric(df["statistics.subscriberCount"], errors="coerce").fillna(0).astype(int)
-    else:
-        df["subscriberCount"] = 0
-    if "statistics.videoCount" in df.columns:
-        df["videoCount"] = pd.to_numeric(df["statistics.videoCount"], errors="coerce").fillna(0).astype(int)
-    else:
-        df["videoCount"] = 0
-    if "snippet.country" in df.columns:
-        df["country"] = df["snippet.country"]
-    else:
-        df["country"] = ""
-    if "contentDetails.relatedPlaylists.uploads" in df.columns:
-        df["uploads_playlist_id"] = df["contentDetails.relatedPlaylists.uploads"]
-    else:
-        df["uploads_playlist_id"] = None
-    return df
+    """Extract only the channel fields used for selection straight from the raw items."""
+    rows = [
+        {
+            "id": item.get("id"),
+            "subscriberCount": _to_int(item.get("statistics", {}).get("subscriberCount")),
+            "videoCount": _to_int(item.get("statistics", {}).get("videoCount")),
+            "country": item.get("snippet", {}).get("country", "") or "",
+            "uploads_playlist_id": item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads"),
+        }
+        for item in channel_items
+    ]
+    return pd.DataFrame.from_records(rows, columns=CANDIDATE_COLUMNS)
+
+
+def _to_int(value: object) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
 
 
 def _pick_balanced_channels(df: pd.DataFrame, target: int) -> pd.DataFrame:
     """Select channels across subscriber quantiles to balance representation."""
     if df.empty:
         return df
-    work = df.copy()
-    # buckets by quantile; duplicates="drop" to handle few unique values
-    bins = min(5, max(1, work["subscriberCount"].nunique()))
-    work["sub_bucket"] = pd.qcut(
-        work["subscriberCount"].rank(method="first"),
-        q=bins,
-        labels=False,
-        duplicates="drop",
-    )
-    selections = []
-    per_bucket = max(1, target // max(1, work["sub_bucket"].nunique()))
-    for bucket in sorted(work["sub_bucket"].dropna().unique()):
-        bucket_df = work[work["sub_bucket"] == bucket].sort_values("subscriberCount", ascending=False)
-        selections.append(bucket_df.head(per_bucket))
-    chosen = pd.concat(selections, ignore_index=True) if selections else pd.DataFrame(columns=work.columns)
+    # one descending sort; equal-sized runs of it are the subscriber quantile buckets
+    sorted_df = df.sort_values("subscriberCount", ascending=False, kind="stable").reset_index(drop=True)
+    bins = min(5, max(1, sorted_df["subscriberCount"].nunique()))
+    per_bucket = max(1, target // bins)
+    sub_bucket = (np.arange(len(sorted_df)) * bins // len(sorted_df)).astype(np.int8)
+    chosen = sorted_df.groupby(sub_bucket, sort=True).head(per_bucket)
     if len(chosen) < target:
-        remaining = work.drop(chosen.index, errors="ignore").sort_values("subscriberCount", ascending=False)
-        chosen = pd.concat([chosen, remaining.head(target - len(chosen))], ignore_index=True)
-    return chosen.head(target).drop(columns=["sub_bucket"], errors="ignore")
+        remaining = sorted_df[~sorted_df.index.isin(chosen.index)]
+        chosen = pd.concat([chosen, remaining.head(target - len(chosen))])
+    return chosen.head(target).reset_index(drop=True)
 
 
 def ingest_videos(video_ids: Iterable[str], output_dir: Optional[str] = None, client: Optional[YouTubeClient] = None) -> str:
@@ -137,10 +168,10 @@ def ingest_videos(video_ids: Iterable[str], output_dir: Optional[str] = None, cl
     if not meta:
         raise ValueError("No video metadata returned.")
 
-    df = pd.json_normalize(meta)
+    table = _to_table(meta)
     dest = os.path.join(bronze_dir, f"videos_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.parquet")
-    write_parquet(df, dest)
-    log.info("Wrote %d videos to %s", len(df), dest)
+    write_parquet_table(table, dest)
+    log.info("Wrote %d videos to %s", table.num_rows, dest)
     return dest
 
 
@@ -152,7 +183,7 @@ def ingest_channel(channel_id: str, limit: int = 100, output_dir: Optional[str]
     uploads_dir = os.path.join(bronze_dir, "uploads")
     ensure_dir(uploads_dir)
 
-    video_ids = client.search_channel_uploads(channel_id, limit=limit)
+    # resolve the uploads playlist once and derive video ids from the same page fetch
     uploads_playlist_id = client.get_uploads_playlist_id(channel_id)
     playlist_items = (
         client.fetch_playlist_items(
@@ -163,10 +194,10 @@ def ingest_channel(channel_id: str, limit: int = 100, output_dir: Optional[str]
         if uploads_playlist_id
         else []
     )
+    video_ids = extract_video_ids(playlist_items, limit)
 
     uploads_path = os.path.join(uploads_dir, f"{channel_id}.parquet")
-    uploads_df = _to_frame(playlist_items)
-    write_parquet(uploads_df, uploads_path)
+    write_parquet_table(_to_table(playlist_items), uploads_path)
 
     videos_path = ingest_videos(video_ids, output_dir=output_dir, client=client)
     log.info("Ingested channel %s with %d videos", channel_id, len(video_ids))
@@ -183,18 +214,11 @@ def _discover_category(
     lookback_days: int,
     search_pages: int,
     overfetch_factor: int,
-    output_dir: Optional[str],
+    dirs: BronzeDirs,
     client: YouTubeClient,
     published_after_iso: Optional[str],
+    refresh: bool,
 ) -> Optional[pd.DataFrame]:
-    bronze_dir = _bronze_dir(output_dir)
-    search_dir = os.path.join(bronze_dir, "search")
-    channels_dir = os.path.join(bronze_dir, "channels")
-    uploads_dir = os.path.join(bronze_dir, "uploads")
-    selection_dir = os.path.join(bronze_dir, "channel_selection")
-    for d in (search_dir, channels_dir, uploads_dir, selection_dir):
-        ensure_dir(d)
-
     log.info("Discovering channels for category %s (%s)", category_name, category_id)
     search_items = client.search_videos_by_category(
         category_id,
@@ -202,17 +226,13 @@ def _discover_category(
         max_pages=search_pages,
         order="viewCount",
         published_after=published_after_iso,
+        refresh=refresh,
     )
-    search_df = _to_frame(search_items)
-    write_parquet(search_df, os.path.join(search_dir, f"category_{category_id}.parquet"))
-
-    channel_ids: List[str] = []
-    seen: set[str] = set()
-    for item in search_items:
-        channel_id = item.get("snippet", {}).get("channelId")
-        if channel_id and channel_id not in seen:
-            seen.add(channel_id)
-            channel_ids.append(channel_id)
+    write_parquet_table(_to_table(search_items), dirs.search / f"category_{category_id}.parquet")
+
+    # dict.fromkeys de-duplicates while keeping first-seen order
+    found = (item.get("snippet", {}).get("channelId") for item in search_items)
+    channel_ids: List[str] = list(dict.fromkeys(cid for cid in found if cid))
     if not channel_ids:
         log.warning("No channels found for category %s", category_id)
         return None
@@ -222,36 +242,62 @@ def _discover_category(
     channel_ids = channel_ids[:overfetch_total]
 
     channel_meta = client.fetch_channel_metadata(channel_ids)
+    channels_table = _to_table(channel_meta)
+    channels_table = channels_table.append_column(
+        "category_id", pa.array([category_id] * channels_table.num_rows, pa.int64())
+    ).append_column("category_name", pa.array([category_name] * channels_table.num_rows, pa.string()))
+    write_parquet_table(channels_table, dirs.channels / f"category_{category_id}.parquet")
     channels_df = _normalize_channels_df(channel_meta)
-    channels_df["category_id"] = category_id
-    channels_df["category_name"] = category_name
-    write_parquet(channels_df, os.path.join(channels_dir, f"category_{category_id}.parquet"))
 
     # filter for US, subscriber threshold, available uploads playlist
     candidates = channels_df[
         (channels_df["subscriberCount"] >= min_subscribers)
         & (channels_df["uploads_playlist_id"].notna())
         & (channels_df["country"].fillna("") == "US")
-    ].copy()
+    ]
 
     if candidates.empty:
         log.warning("No eligible channels after initial filters for category %s", category_id)
         return None
 
-    # activity check via uploads playlist
+    # activity check via uploads playlist; fetches are I/O bound so fan them out
+    # and stop paging each playlist once it reaches uploads older than the window
+    stop_before = _iso_days_ago(lookback_days)
     activity_rows: List[Dict[str, object]] = []
-    for _, row in candidates.iterrows():
-        playlist_id = row["uploads_playlist_id"]
-        playlist_items = client.fetch_playlist_items(playlist_id, page_size=50, max_pages=5)
-        uploads_count, recent_video_ids = _count_recent_uploads(playlist_items, lookback_days=lookback_days)
-        uploads_df = _to_frame(playlist_items)
-        write_parquet(uploads_df, os.path.join(uploads_dir, f"{row['id']}.parquet"))
-
-        if uploads_count >= min_uploads_last_year:
-            row_data = row.to_dict()
-            row_data["uploads_last_year"] = uploads_count
-            row_data["recent_video_ids"] = recent_video_ids
-            activity_rows.append(row_data)
+    uploads_tables: List[pa.Table] = []
+    rows = candidates[CANDIDATE_COLUMNS].to_dict(orient="records")
+    with ThreadPoolExecutor(max_workers=ACTIVITY_PROBE_WORKERS) as pool:
+        futures = [
+            (
+                row,
+                pool.submit(
+                    client.fetch_playlist_items,
+                    row["uploads_playlist_id"],
+                    page_size=50,
+                    max_pages=5,
+                    stop_before=stop_before,
+                ),
+            )
+            for row in rows
+        ]
+        for row, future in futures:
+            playlist_items = future.result()
+            uploads_count, recent_video_ids = _count_recent_uploads(playlist_items, lookback_days=lookback_days)
+            if playlist_items:
+                uploads_table = _to_table(playlist_items)
+                uploads_tables.append(
+                    uploads_table.append_column("channel_id", pa.array([row["id"]] * uploads_table.num_rows, pa.string()))
+                )
+
+            if uploads_count >= min_uploads_last_year:
+                activity_rows.append(row | {"uploads_last_year": uploads_count, "recent_video_ids": recent_video_ids})
+
+    # one uploads file per category; channels differ in optional fields so unify schemas
+    if uploads_tables:
+        write_parquet_table(
+            pa.concat_tables(uploads_tables, promote_options="permissive"),
+            dirs.category_uploads / f"category_{category_id}.parquet",
+        )
 
     if not activity_rows:
         log.warning("No active channels passed activity filter for category %s", category_id)
@@ -262,7 +308,7 @@ def _discover_category(
     selected["category_id"] = category_id
     selected["category_name"] = category_name
 
-    write_parquet(selected, os.path.join(selection_dir, f"category_{category_id}.parquet"))
+    write_parquet(selected, dirs.selection / f"category_{category_id}.parquet")
     return selected
 
 
@@ -277,45 +323,50 @@ def discover_channels(
     output_dir: Optional[str] = None,
     client: Optional[YouTubeClient] = None,
     published_after_days: int = 120,
+    refresh: bool = False,
+    workers: int = DEFAULT_CATEGORY_WORKERS,
 ) -> pd.DataFrame:
     """
     Discover candidate channels per category and persist Bronze artifacts.
 
+    Search results are served from the on-disk cache unless `refresh` is set.
+    Up to `workers` categories are processed concurrently.
+
     Returns a dataframe of selected channels across the 10 categories.
     """
     cfg = get_config()
     client = client or YouTubeClient(api_key=cfg.youtube_api_key)
+    dirs = _bronze_dirs(output_dir)
 
     published_after_iso = None
     if published_after_days:
-        published_after_iso = (datetime.now(timezone.utc) - timedelta(days=published_after_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-    selections: List[pd.DataFrame] = []
-
-    for category_id, category_name in CATEGORY_MAP.items():
-        selected = _discover_category(
-            category_id,
-            category_name,
+        # day granularity keeps the search cache key stable across same-day re-runs
+        published_after_iso = (datetime.now(timezone.utc) - timedelta(days=published_after_days)).strftime("%Y-%m-%dT00:00:00Z")
+
+    # categories are independent and network bound, so discover them concurrently;
+    # the client is thread-safe (per-thread Http, shared token bucket)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        discover = functools.partial(
+            _discover_category,
             per_category=per_category,
             min_subscribers=min_subscribers,
             min_uploads_last_year=min_uploads_last_year,
             lookback_days=lookback_days,
             search_pages=search_pages,
             overfetch_factor=overfetch_factor,
-            output_dir=output_dir,
+            dirs=dirs,
             client=client,
             published_after_iso=published_after_iso,
+            refresh=refresh,
         )
-        if selected is not None:
-            selections.append(selected)
+        results = pool.map(discover, CATEGORY_MAP.keys(), CATEGORY_MAP.values())
+        selections = [selected for selected in results if selected is not None]
 
     if not selections:
         raise RuntimeError("No channels selected across categories.")
 
     final_df = pd.concat(selections, ignore_index=True)
-    selection_dir = os.path.join(_bronze_dir(output_dir), "channel_selection")
-    ensure_dir(selection_dir)
-    final_path = os.path.join(selection_dir, "all_categories.parquet")
+    final_path = dirs.selection / "all_categories.parquet"
     write_parquet(final_df, final_path)
     log.info("Channel discovery complete. Selected %d channels written to %s", len(final_df), final_path)
     return final_df
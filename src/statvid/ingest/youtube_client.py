@@ -1,17 +1,72 @@
 """Thin client for YouTube Data API v3 with retry/backoff."""
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
+import os
 import random
+import threading
 import time
+import zlib
 from typing import Iterable, Any, Dict, List, Optional
 
+import httplib2
+import orjson
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from ..config import get_config
+from ..utils.io import read_ndjson, write_ndjson
+from ..utils.paths import get_paths
+from ..utils.rate_limit import TokenBucket
 
 PAGE_LIMIT = 50  # YouTube Data API'S hard limit for maximum returns per page.
+BATCH_LIMIT = 50  # Sub-requests queued per batch HTTP call (Google caps batches at 1000).
+UPLOADS_CACHE_SIZE = 4096
+HTTP_TIMEOUT_SECONDS = 30
+
+
+def extract_video_ids(playlist_items: Iterable[Dict[str, Any]], limit: Optional[int] = None) -> List[str]:
+    """Return video ids from playlist items, preserving order."""
+    video_ids: List[str] = []
+    for item in playlist_items:
+        vid = item.get("contentDetails", {}).get("videoId")
+        if vid:
+            video_ids.append(vid)
+            if limit is not None and len(video_ids) >= limit:
+                break
+    return video_ids
+
+
+# httplib2 connections are not thread-safe, so each thread keeps its own keep-alive Http
+_thread_local = threading.local()
+
+
+@functools.lru_cache(maxsize=8)
+def _build_service(api_key: str):
+    """Build the YouTube service once per API key from the bundled discovery document."""
+    # cache_discovery False to avoid filesystem writes in potentially containerized environments
+    return build("youtube", "v3", developerKey=api_key, cache_discovery=False, static_discovery=True)
+
+
+@functools.lru_cache(maxsize=8)
+def _token_bucket(api_key: str, max_qps: float) -> TokenBucket:
+    """Return the bucket shared by every client and thread using this key."""
+    return TokenBucket(rate=max_qps, capacity=2 * max_qps)
+
+
+def _thread_http() -> httplib2.Http:
+    """Return this thread's Http, creating it on first use."""
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+        _thread_local.http = http
+    return http
+
+
+def _published_at(item: Dict[str, Any]) -> Optional[str]:
+    return item.get("contentDetails", {}).get("videoPublishedAt") or item.get("snippet", {}).get("publishedAt")
 
 
 class YouTubeClient:
@@ -22,7 +77,10 @@ class YouTubeClient:
         api_key: Optional[str] = None,
         max_retries: int = 3,
         backoff_seconds: float = 1.5,
-        page_max: int = 50
+        page_max: int = 50,
+        max_qps: float = 20.0,
+        cache_dir: Optional[str] = None,
+        cache_ttl_seconds: Optional[int] = None,
     ) -> None:
         cfg = get_config()
         self.api_key = api_key or cfg.youtube_api_key
@@ -32,21 +90,50 @@ class YouTubeClient:
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
         self.page_max = min(page_max, PAGE_LIMIT)
+        self.max_qps = max_qps
+        self._bucket = _token_bucket(self.api_key, max_qps)
+        self.cache_dir = cache_dir or os.path.join(get_paths().bronze, "http_cache")
+        self.cache_ttl_seconds = cfg.cache_ttl_seconds if cache_ttl_seconds is None else cache_ttl_seconds
 
-        self._service_obj = None
+        # uploads playlist ids already seen in channel metadata, keyed by channel id
+        self._known_uploads_playlists: Dict[str, str] = {}
+        self._lookup_uploads_playlist_id = functools.lru_cache(maxsize=UPLOADS_CACHE_SIZE)(
+            self._fetch_uploads_playlist_id
+        )
         self.log = logging.getLogger(__name__)
 
     def _get_service(self):
-        if self._service_obj is None:
-            # cache_discovery False to avoid filesystem writes in potentially containerized environments
-            self._service_obj = build("youtube", "v3", developerKey=self.api_key, cache_discovery=False)
-        return self._service_obj
+        # shared across clients and threads; requests are executed over a per-thread Http
+        return _build_service(self.api_key)
+
+    def _cache_path(self, label: str, **params: Any) -> str:
+        key = hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return os.path.join(self.cache_dir, f"{label}_{key}.ndjson.gz")
+
+    def _read_cache(self, path: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached items if present and younger than the TTL."""
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return None
+        if age > self.cache_ttl_seconds:
+            return None
+        try:
+            return read_ndjson(path)
+        except (OSError, EOFError, zlib.error, orjson.JSONDecodeError):
+            # unreadable cache entries (e.g. left by an older interrupted run) count as misses
+            self.log.warning("Ignoring unreadable cache file %s", path)
+            return None
+
+    def _execute(self, request, label: str, cost: int = 1) -> Dict[str, Any]:
+        """Execute a YouTube request paced by the shared token bucket, with exponential backoff.
 
-    def _execute(self, request, label: str) -> Dict[str, Any]:
-        """Execute a YouTube request with simple exponential backoff."""
+        `cost` is the number of API calls the request carries (sub-requests for a batch).
+        """
         for attempt in range(self.max_retries + 1):
+            self._bucket.acquire(cost)
             try:
-                return request.execute()
+                return request.execute(http=_thread_http())
             except HttpError as exc:
                 status = getattr(exc.resp, "status", None)
                 if status in (403, 500, 503) and attempt < self.max_retries:
@@ -64,34 +151,69 @@ class YouTubeClient:
                 raise
         raise RuntimeError(f"Exceeded retries for YouTube request: {label}")
 
+    def _execute_batch(self, requests: List[Any], label: str) -> List[Dict[str, Any]]:
+        """Execute requests as batch HTTP calls, returning items in request order.
+
+        Sub-requests that fail inside a batch are re-issued through `_execute`
+        so they get the same retry/backoff treatment as single requests.
+        """
+        responses: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, Any] = {}
+        for start in range(0, len(requests), BATCH_LIMIT):
+            chunk = {str(start + offset): req for offset, req in enumerate(requests[start : start + BATCH_LIMIT])}
+
+            def _callback(request_id: str, response: Dict[str, Any], exception: Optional[HttpError]) -> None:
+                if exception is not None:
+                    failed[request_id] = chunk[request_id]
+                else:
+                    responses[request_id] = response
+
+            batch = self._get_service().new_batch_http_request(callback=_callback)
+            for request_id, req in chunk.items():
+                batch.add(req, request_id=request_id)
+            self._execute(batch, f"batch {label}", cost=len(chunk))
+
+        for request_id, req in failed.items():
+            responses[request_id] = self._execute(req, label)
+
+        results: List[Dict[str, Any]] = []
+        for i in range(len(requests)):
+            results.extend(responses[str(i)].get("items", []))
+        return results
+
     def fetch_video_metadata(self, video_ids: Iterable[str]) -> List[Dict[str, Any]]:
         """Fetch snippet/statistics/contentDetails for a list of video IDs."""
         ids = [vid for vid in video_ids if vid]
-        results: List[Dict[str, Any]] = []
+        requests = []
         for i in range(0, len(ids), self.page_max):
             chunk = ids[i : i + self.page_max]
-            req = self._get_service().videos().list(
-                part="snippet,statistics,contentDetails",
-                id=",".join(chunk),
-                maxResults=len(chunk),
+            requests.append(
+                self._get_service().videos().list(
+                    part="snippet,statistics,contentDetails",
+                    id=",".join(chunk),
+                    maxResults=len(chunk),
+                )
             )
-            resp = self._execute(req, "videos.list")
-            results.extend(resp.get("items", []))
-        return results
+        return self._execute_batch(requests, "videos.list")
 
     def fetch_channel_metadata(self, channel_ids: Iterable[str]) -> List[Dict[str, Any]]:
         """Fetch snippet/statistics/contentDetails for channel ids."""
         ids = [cid for cid in channel_ids if cid]
-        results: List[Dict[str, Any]] = []
+        requests = []
         for i in range(0, len(ids), self.page_max):
             chunk = ids[i : i + self.page_max]
-            req = self._get_service().channels().list(
-                part="snippet,statistics,contentDetails",
-                id=",".join(chunk),
-                maxResults=len(chunk),
+            requests.append(
+                self._get_service().channels().list(
+                    part="snippet,statistics,contentDetails",
+                    id=",".join(chunk),
+                    maxResults=len(chunk),
+                )
             )
-            resp = self._execute(req, "channels.list")
-            results.extend(resp.get("items", []))
+        results = self._execute_batch(requests, "channels.list")
+        for item in results:
+            uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+            if uploads:
+                self._known_uploads_playlists[item["id"]] = uploads
         return results
 
     def search_videos_by_category(
@@ -103,8 +225,27 @@ class YouTubeClient:
         max_pages: int = 5,
         order: str = "date",
         published_after: Optional[str] = None,
+        refresh: bool = False,
     ) -> List[Dict[str, Any]]:
-        """Search videos for a category and return raw search items."""
+        """Search videos for a category and return raw search items.
+
+        Results are cached on disk for `cache_ttl_seconds`; pass refresh=True to bypass.
+        """
+        cache_path = self._cache_path(
+            "search",
+            category_id=category_id,
+            region_code=region_code,
+            page_size=page_size,
+            max_pages=max_pages,
+            order=order,
+            published_after=published_after,
+        )
+        if not refresh:
+            cached = self._read_cache(cache_path)
+            if cached is not None:
+                self.log.info("Using cached search results for category %s", category_id)
+                return cached
+
         items: List[Dict[str, Any]] = []
         page_token: Optional[str] = None
         pages_fetched = 0
@@ -126,10 +267,17 @@ class YouTubeClient:
             pages_fetched += 1
             if not page_token:
                 break
+        write_ndjson(items, cache_path)
         return items
 
     def get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
-        """Return uploads playlist id for a channel."""
+        """Return uploads playlist id for a channel, reusing ids already fetched."""
+        known = self._known_uploads_playlists.get(channel_id)
+        if known:
+            return known
+        return self._lookup_uploads_playlist_id(channel_id)
+
+    def _fetch_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
         req = self._get_service().channels().list(
             part="contentDetails",
             id=channel_id,
@@ -147,8 +295,14 @@ class YouTubeClient:
         *,
         page_size: int = 50,
         max_pages: int = 5,
+        stop_before: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Fetch playlist items (e.g., uploads) with pagination."""
+        """Fetch playlist items (e.g., uploads) with pagination.
+
+        Uploads playlists are newest-first, so when `stop_before` (a UTC
+        `YYYY-MM-DDTHH:MM:SSZ` timestamp) is given, pagination stops after the
+        first page that reaches items published before it.
+        """
         items: List[Dict[str, Any]] = []
         token: Optional[str] = None
         pages = 0
@@ -160,11 +314,17 @@ class YouTubeClient:
                 pageToken=token,
             )
             resp = self._execute(req, "playlistItems.list")
-            items.extend(resp.get("items", []))
+            page_items = resp.get("items", [])
+            items.extend(page_items)
             token = resp.get("nextPageToken")
             pages += 1
             if not token:
                 break
+            if stop_before:
+                # ISO-8601 UTC strings order lexicographically
+                published = [ts for ts in map(_published_at, page_items) if ts]
+                if published and min(published) < stop_before:
+                    break
         return items
 
     def search_channel_uploads(self, channel_id: str, limit: int = 50) -> List[str]:
@@ -178,11 +338,4 @@ class YouTubeClient:
             page_size=min(limit, self.page_max),
             max_pages=max_pages,
         )
-        video_ids: List[str] = []
-        for item in items:
-            vid = item.get("contentDetails", {}).get("videoId")
-            if vid:
-                video_ids.append(vid)
-                if len(video_ids) >= limit:
-                    break
-        return video_ids
+        return extract_video_ids(items, limit)
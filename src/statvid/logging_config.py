@@ -7,11 +7,13 @@ from .config import get_config
 
 
 def configure_logging() -> None:
+    """Attach a stdout handler to the root logger once; later calls are no-ops."""
+    root = logging.getLogger()
+    if root.handlers:
+        return
     cfg = get_config()
     level = getattr(logging, cfg.log_level.upper(), logging.INFO)
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
-
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+    root.addHandler(handler)
+    root.setLevel(level)
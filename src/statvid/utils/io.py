@@ -1,9 +1,16 @@
 """I/O helpers for Parquet files and safe writes."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable
+import gzip
 import os
+import tempfile
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ZSTD_DEFAULT_LEVEL = 3
 
 
 def ensure_dir(path: str) -> None:
@@ -11,13 +18,76 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def write_parquet(df: "Any", path: str) -> None:
-    """Write dataframe to parquet at path. Placeholder."""
+def write_parquet(
+    df: "Any",
+    path: "str | os.PathLike[str]",
+    *,
+    compression: str = "zstd",
+    compression_level: int | None = None,
+    row_group_size: int = 64_000,
+) -> None:
+    """Write dataframe to parquet at path."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    write_parquet_table(
+        table,
+        path,
+        compression=compression,
+        compression_level=compression_level,
+        row_group_size=row_group_size,
+    )
+
+
+def write_parquet_table(
+    table: pa.Table,
+    path: "str | os.PathLike[str]",
+    *,
+    compression: str = "zstd",
+    compression_level: int | None = None,
+    row_group_size: int = 64_000,
+) -> None:
+    """Write an Arrow table to parquet at path, skipping the pandas layer.
+
+    Level 3 is used for zstd when no `compression_level` is given; other codecs
+    keep their own default (snappy and none do not accept a level).
+    """
+    if compression_level is None and compression == "zstd":
+        compression_level = ZSTD_DEFAULT_LEVEL
     dirpath = os.path.dirname(path) or "."
     ensure_dir(dirpath)
-    df.to_parquet(path, index=False)
+    pq.write_table(
+        table,
+        path,
+        compression=compression,
+        compression_level=compression_level,
+        row_group_size=row_group_size,
+    )
 
 
 def read_parquet(path: str) -> "Any":
     """Read parquet into a dataframe. Placeholder."""
     return pd.read_parquet(path)
+
+
+def write_ndjson(items: "Iterable[Any]", path: "str | os.PathLike[str]") -> None:
+    """Write items as gzipped newline-delimited JSON at path.
+
+    The file is written to a temp file beside `path` and moved into place, so an
+    interrupted write never leaves a truncated file at `path`.
+    """
+    dirpath = os.path.dirname(path) or "."
+    ensure_dir(dirpath)
+    fd, tmp_path = tempfile.mkstemp(dir=dirpath, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wb") as fh:
+            for item in items:
+                fh.write(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_ndjson(path: "str | os.PathLike[str]") -> "list[Any]":
+    """Read a gzipped newline-delimited JSON file written by `write_ndjson`."""
+    with gzip.open(path, "rb") as fh:
+        return [orjson.loads(line) for line in fh if line.strip()]
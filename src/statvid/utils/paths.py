@@ -1,6 +1,7 @@
 """Centralized path helpers for data lake directories."""
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from ..config import get_config
@@ -16,6 +17,7 @@ class DataPaths:
     external: str
 
 
+@functools.lru_cache(maxsize=1)
 def get_paths() -> DataPaths:
     cfg = get_config()
     base = os.path.abspath(cfg.data_dir)
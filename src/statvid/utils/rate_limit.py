@@ -0,0 +1,30 @@
+"""Client-side rate limiting helpers."""
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilling at `rate` tokens/second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n: float = 1) -> None:
+        """Take `n` tokens, sleeping until they are available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens >= n:
+                self.tokens -= n
+                return
+            # sleep while holding the lock so waiting threads are served in turn
+            time.sleep((n - self.tokens) / self.rate)
+            self.tokens = 0.0
+            self.last = time.monotonic()
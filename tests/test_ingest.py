@@ -0,0 +1,57 @@
+import pandas as pd
+
+from statvid.ingest.ingest import (
+    _count_recent_uploads,
+    _iso_days_ago,
+    _normalize_channels_df,
+    _pick_balanced_channels,
+    _to_table,
+)
+
+
+def test_count_recent_uploads_window():
+    uploads = [
+        {"contentDetails": {"videoId": "a", "videoPublishedAt": _iso_days_ago(10)}},
+        {"contentDetails": {"videoId": "b"}, "snippet": {"publishedAt": _iso_days_ago(20)}},
+        {"contentDetails": {"videoId": "c", "videoPublishedAt": _iso_days_ago(400)}},
+    ]
+    assert _count_recent_uploads(uploads, lookback_days=365) == (2, ["a", "b"])
+    assert _count_recent_uploads([], lookback_days=365) == (0, [])
+
+
+def test_pick_balanced_channels_spans_buckets():
+    df = pd.DataFrame({"id": [f"c{i}" for i in range(20)], "subscriberCount": [i * 1000 for i in range(20)]})
+    chosen = _pick_balanced_channels(df, 5)
+    assert len(chosen) == 5
+    assert chosen["id"].is_unique
+    # one channel from each subscriber quintile
+    assert sorted(chosen["subscriberCount"] // 4000) == [0, 1, 2, 3, 4]
+
+
+def test_to_table_flattens_nested_fields():
+    items = [
+        {"id": "c1", "statistics": {"subscriberCount": "1200"}, "contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}},
+        {"id": "c2", "snippet": {"title": "t"}},
+    ]
+    table = _to_table(items)
+    assert sorted(table.column_names) == [
+        "contentDetails.relatedPlaylists.uploads",
+        "id",
+        "snippet.title",
+        "statistics.subscriberCount",
+    ]
+    assert table.column("contentDetails.relatedPlaylists.uploads").to_pylist() == ["UU1", None]
+    assert _to_table([]).column_names == ["_empty"]
+    assert _to_table([]).num_rows == 0
+
+
+def test_normalize_channels_projects_selection_fields():
+    items = [
+        {"id": "c1", "statistics": {"subscriberCount": "1200"}, "snippet": {"country": "US"},
+         "contentDetails": {"relatedPlaylists": {"uploads": "UU1"}}},
+        {"id": "c2", "statistics": {"subscriberCount": "50", "videoCount": "3"}, "snippet": {}},
+    ]
+    df = _normalize_channels_df(items)
+    assert df["subscriberCount"].tolist() == [1200, 50]
+    assert df["videoCount"].tolist() == [0, 3]
+    assert df["uploads_playlist_id"].tolist() == ["UU1", None]
@@ -0,0 +1,19 @@
+import pandas as pd
+import pytest
+
+from statvid.utils.io import read_ndjson, read_parquet, write_ndjson, write_parquet
+
+
+def test_ndjson_roundtrip(tmp_path):
+    items = [{"id": "a", "snippet": {"title": "t"}}, {"id": "b"}]
+    path = tmp_path / "cache" / "items.ndjson.gz"
+    write_ndjson(items, path)
+    assert read_ndjson(path) == items
+
+
+@pytest.mark.parametrize("compression", ["zstd", "snappy", "none"])
+def test_write_parquet_codecs(tmp_path, compression):
+    df = pd.DataFrame({"id": ["a", "b"], "views": [1, 2]})
+    path = tmp_path / f"out_{compression}.parquet"
+    write_parquet(df, path, compression=compression)
+    pd.testing.assert_frame_equal(read_parquet(path), df)
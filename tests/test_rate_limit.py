@@ -0,0 +1,36 @@
+import pytest
+
+from statvid.utils import rate_limit
+from statvid.utils.rate_limit import TokenBucket
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_bursts_then_paces(monkeypatch):
+    clock = _FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+
+    bucket = TokenBucket(rate=100, capacity=5)
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.sleeps == []
+
+    bucket.acquire()
+    bucket.acquire(3)
+    assert clock.sleeps == pytest.approx([0.01, 0.03])
+
+    clock.now += 0.05  # refills five tokens
+    bucket.acquire(2)
+    assert len(clock.sleeps) == 2
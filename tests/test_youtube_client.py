@@ -0,0 +1,117 @@
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import httplib2
+import pytest
+
+from statvid.ingest import youtube_client
+from statvid.ingest.youtube_client import YouTubeClient
+
+_BOUNDARY = "batch_boundary"
+
+
+def _videos_response(query):
+    ids = parse_qs(query)["id"][0].split(",")
+    return json.dumps({"items": [{"id": vid} for vid in ids]})
+
+
+class _FakeBatchHttp:
+    """Answers batch calls in reverse order, failing sub-requests for `fail_id` with a 500."""
+
+    def __init__(self, fail_id):
+        self.fail_id = fail_id
+        self.batch_calls = 0
+        self.single_calls = []
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        if not uri.endswith("/batch"):
+            self.single_calls.append(uri)
+            return httplib2.Response({"status": "200"}), _videos_response(urlsplit(uri).query).encode()
+
+        self.batch_calls += 1
+        parts = re.findall(r"Content-ID: <([^>]+)>\s+GET (\S+) HTTP", body)
+        lines = []
+        for content_id, path in reversed(parts):
+            query = urlsplit(path).query
+            if self.fail_id in parse_qs(query)["id"][0].split(","):
+                status, payload = "500 Internal Server Error", json.dumps({"error": {"code": 500}})
+            else:
+                status, payload = "200 OK", _videos_response(query)
+            lines += [
+                f"--{_BOUNDARY}",
+                "Content-Type: application/http",
+                f"Content-ID: <response-{content_id}>",
+                "",
+                f"HTTP/1.1 {status}",
+                "Content-Type: application/json",
+                "",
+                payload,
+            ]
+        lines.append(f"--{_BOUNDARY}--")
+        resp = httplib2.Response({"status": "200", "content-type": f"multipart/mixed; boundary={_BOUNDARY}"})
+        return resp, "\r\n".join(lines).encode()
+
+
+def _client_with_fake_execute(tmp_path, pages):
+    client = YouTubeClient(api_key="test-key", cache_dir=str(tmp_path))
+    calls = []
+
+    def fake_execute(request, label, cost=1):
+        calls.append(label)
+        return pages[len(calls) - 1]
+
+    client._execute = fake_execute
+    return client, calls
+
+
+def _truncate(data):
+    return data[: len(data) // 2]
+
+
+def _corrupt(data):
+    # keep the gzip header, flip every byte of the deflate stream
+    return data[:10] + bytes(b ^ 0xFF for b in data[10:-8]) + data[-8:]
+
+
+@pytest.mark.parametrize("damage", [_truncate, _corrupt])
+def test_search_cache_refetches_after_damaged_file(tmp_path, damage):
+    pages = [{"items": [{"id": "v1"}]}, {"items": [{"id": "v2"}]}]
+    client, calls = _client_with_fake_execute(tmp_path, pages)
+    assert client.search_videos_by_category(2, max_pages=1) == [{"id": "v1"}]
+    assert client.search_videos_by_category(2, max_pages=1) == [{"id": "v1"}]
+    assert len(calls) == 1
+
+    (cache_file,) = tmp_path.iterdir()
+    cache_file.write_bytes(damage(cache_file.read_bytes()))
+
+    assert client.search_videos_by_category(2, max_pages=1) == [{"id": "v2"}]
+    assert len(calls) == 2
+
+def test_batch_metadata_keeps_request_order_and_retries_failed_chunks(monkeypatch):
+    fake_http = _FakeBatchHttp(fail_id="c")
+    monkeypatch.setattr(youtube_client, "_thread_http", lambda: fake_http)
+    monkeypatch.setattr(youtube_client, "BATCH_LIMIT", 2)
+    client = YouTubeClient(api_key="test-key", page_max=1, max_qps=1000)
+
+    items = client.fetch_video_metadata(["a", "b", "c", "d", "e"])
+
+    assert [item["id"] for item in items] == ["a", "b", "c", "d", "e"]
+    assert fake_http.batch_calls == 3
+    assert len(fake_http.single_calls) == 1
+    assert "id=c" in fake_http.single_calls[0]
+
+
+def test_fetch_playlist_items_stops_before_window(tmp_path):
+    pages = [
+        {"items": [{"contentDetails": {"videoPublishedAt": "2026-09-01T00:00:00Z"}}], "nextPageToken": "p2"},
+        {"items": [{"snippet": {"publishedAt": "2026-04-01T00:00:00Z"}}], "nextPageToken": "p3"},
+        {"items": [{"contentDetails": {"videoPublishedAt": "2026-03-01T00:00:00Z"}}]},
+    ]
+    client, calls = _client_with_fake_execute(tmp_path, pages)
+    items = client.fetch_playlist_items("UU1", stop_before="2026-05-01T00:00:00Z")
+    assert len(items) == 2
+    assert len(calls) == 2
+
+    client, calls = _client_with_fake_execute(tmp_path, pages)
+    assert len(client.fetch_playlist_items("UU1")) == 3